@@ -25,8 +25,10 @@ setup(
     install_requires=[
         "pygments~=2.9.0",
         "tqdm~=4.60.0",
+        "ijson~=3.1",
         "jsonlines~=2.0.0",
-        "sortedcollections~=2.1.0",
+        "orjson~=3.6",
+        "sortedcontainers~=2.4",
     ],
     entry_points={
         "console_scripts": [
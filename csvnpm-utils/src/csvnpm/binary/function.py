@@ -1,5 +1,4 @@
 from collections import defaultdict
-from json import dumps
 from typing import DefaultDict, Mapping, Optional, Set, Tuple
 
 from csvnpm.binary.ida_ast import AST
@@ -54,7 +53,7 @@ class Function:
     @classmethod
     def from_json(cls, d):
         ast = AST.from_json(d["t"]) if d["t"] else None
-        return_type = TypeLibCodec.decode(dumps(d["r"]))
+        return_type = TypeLibCodec.decode_parsed(d["r"])
         arguments = dict()
         for key, args in d["a"].items():
             arguments[location_from_json_key(key)] = {
@@ -6,7 +6,6 @@ ctype_t, which is just an integer. This is stored in "meta"
 
 
 import typing as t
-from json import dumps
 
 from csvnpm.binary.types.typeinfo import TypeInfo
 from csvnpm.binary.types.typelib import TypeLibCodec
@@ -555,7 +554,7 @@ class Call(Expression):
 
         @classmethod
         def from_json(cls, d) -> "Call.Arg":
-            formal_type: TypeInfo = TypeLibCodec.decode(dumps(d["t"]))  # type: ignore
+            formal_type: TypeInfo = TypeLibCodec.decode_parsed(d["t"])  # type: ignore
             return cls(
                 node_id=d["id"],
                 is_vararg=d["va"],
@@ -872,7 +871,7 @@ class Type(Expression):
 
     @classmethod
     def from_json(cls, d) -> "Type":
-        typ: TypeInfo = TypeLibCodec.decode(dumps(d["t"]))  # type: ignore
+        typ: TypeInfo = TypeLibCodec.decode_parsed(d["t"])  # type: ignore
         return cls(node_id=d["id"], typ=typ)
 
     @classmethod
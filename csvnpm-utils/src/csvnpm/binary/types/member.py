@@ -1,4 +1,8 @@
-from typing import Any, Dict, Type, TypeVar
+import sys
+from functools import lru_cache
+from typing import Any, Dict, List, Tuple, Type, TypeVar
+
+from csvnpm.binary.types.typeinfo import Encoded
 
 _T = TypeVar("_T")
 
@@ -6,31 +10,53 @@ _T = TypeVar("_T")
 class Member:
     """A member of a UDT. Can be a Field or Padding"""
 
-    size: int = 0
+    __slots__ = ("size",)
+
+    size: int
+    # Tag of the class in encoded JSON, also used to dispatch on the class
+    KIND: int
 
     def __init__(self) -> None:
         raise NotImplementedError
 
     @classmethod
-    def _from_json(cls: Type[_T], d: Dict[str, Any]) -> _T:
+    def _from_json(cls: Type[_T], d: Encoded) -> _T:
         raise NotImplementedError
 
-    def _to_json(self) -> Dict[str, Any]:
+    def _to_json(self) -> List[Any]:
         raise NotImplementedError
 
 
 class Padding(Member):
     """Padding bytes in a struct or union"""
 
+    __slots__ = ()
+
+    KIND = 5
+    # Padding is never modified, so there is one instance per size
+    _instances: Dict[int, "Padding"] = {}
+
+    def __new__(cls, size: int) -> "Padding":
+        padding = cls._instances.get(size)
+        if padding is None:
+            padding = cls._instances[size] = super().__new__(cls)
+            padding.size = size
+        return padding
+
     def __init__(self, size: int):
-        self.size = size
+        # size is set once by __new__
+        pass
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return (self.__class__, (self.size,))
 
     @classmethod
-    def _from_json(cls, d: Dict[str, int]):
-        return cls(size=d["s"])
+    def _from_json(cls, d: Encoded):
+        size = d[1] if isinstance(d, list) else d["s"]
+        return cls(size=size)
 
-    def _to_json(self) -> Dict[str, int]:
-        return {"T": 5, "s": self.size}
+    def _to_json(self) -> List[int]:
+        return [self.KIND, self.size]
 
     def __eq__(self, other: Any) -> bool:
         if isinstance(other, Padding):
@@ -47,22 +73,40 @@ class Padding(Member):
 class Field(Member):
     """Information about a field in a struct or union"""
 
+    __slots__ = ("name", "type_name")
+
+    KIND = 4
+
     def __init__(self, *, name: str, size: int, type_name: str):
         self.name = name
         self.type_name = type_name
         self.size = size
 
     @classmethod
-    def _from_json(cls, d: Dict[str, Any]):
-        return cls(name=d["n"], type_name=d["t"], size=d["s"])
-
-    def _to_json(self) -> Dict[str, Any]:
-        return {
-            "T": 4,
-            "n": self.name,
-            "t": self.type_name,
-            "s": self.size,
-        }
+    @lru_cache(maxsize=1 << 16)
+    def make(cls, *, name: str, size: int, type_name: str) -> "Field":
+        """
+        Returns a shared Field for repeated members such as `int x`, so they
+        must not be modified.
+
+        :param name: name of the field
+        :param size: size of the field
+        :param type_name: name of the type of the field
+        :return: Field instance
+        """
+        return cls(name=name, size=size, type_name=type_name)
+
+    @classmethod
+    def _from_json(cls, d: Encoded):
+        if isinstance(d, list):
+            _, name, type_name, size = d
+        else:
+            name, type_name, size = d["n"], d["t"], d["s"]
+        # Not interned: equality ignores size, so equal fields may differ in it
+        return cls(name=sys.intern(name), type_name=sys.intern(type_name), size=size)
+
+    def _to_json(self) -> List[Any]:
+        return [self.KIND, self.name, self.type_name, self.size]
 
     def __eq__(self, other: Any) -> bool:
         if isinstance(other, Field):
@@ -1,19 +1,79 @@
-from typing import Any, Dict, List, Optional, Tuple
+import sys
+from operator import attrgetter
+from typing import Any, Dict, List, Optional, Tuple, TypeVar
 from typing import Union as tUnion
 
+_T = TypeVar("_T")
+
+_get_size = attrgetter("size")
+
+# Types are encoded as lists tagged by class, e.g. [1, "int", 4]. Dicts
+# tagged by "T" are the previous format, and can still be decoded.
+Encoded = tUnion[List[Any], Dict[str, Any]]
+
+# Canonical instances of decoded immutable types, keyed by (class, instance)
+_interned: Dict[Tuple[type, Any], Any] = {}
+
+# Shared offset tuples, keyed by (size, step)
+_RANGE_CACHE: Dict[Tuple[int, int], Tuple[int, ...]] = {}
+
+
+def _intern(obj: _T) -> _T:
+    """
+    Deduplicates decoded types so that equal types share a single instance.
+    Only use with types whose equality covers all of their state and that
+    are never mutated.
+
+    :param obj: newly decoded instance
+    :return: the canonical instance equal to obj
+    """
+    return _interned.setdefault((type(obj), obj), obj)
+
+
+def _intern_str(s: Optional[str]) -> Optional[str]:
+    """
+    :param s: string or None
+    :return: interned string or None
+    """
+    return sys.intern(s) if s is not None else None
+
+
+def _frange(n: int, step: int = 1) -> Tuple[int, ...]:
+    """
+    Most types share a few small sizes, so their offsets are shared too.
+    The returned tuple must not be modified.
+
+    :param n: end of the range
+    :param step: step of the range
+    :return: the canonical tuple(range(0, n, step))
+    """
+    key = (n, step)
+    offsets = _RANGE_CACHE.get(key)
+    if offsets is None:
+        offsets = _RANGE_CACHE[key] = tuple(range(0, n, step))
+    return offsets
+
 
 class TypeInfo:
     """Stores information about a type"""
 
+    __slots__ = ("name", "size", "_accessible")
+
+    # Tag of the class in encoded JSON, also used to dispatch on the class
+    KIND = 1
+
     def __init__(self, *, name: Optional[str], size: int):
         self.name = name
         self.size = size
+        self._accessible: Optional[Tuple[int, ...]] = None
 
     def accessible_offsets(self) -> Tuple[int, ...]:
         """
         :return: Offsets accessible in this type
         """
-        return tuple(range(self.size))
+        if self._accessible is None:
+            self._accessible = _frange(self.size)
+        return self._accessible
 
     def inaccessible_offsets(self) -> Tuple[int, ...]:
         """
@@ -33,37 +93,45 @@ class TypeInfo:
         :param others: types to compare against
         :return: bool of can be replaced
         """
-        if self.size != sum(other.size for other in others):
+        if self.size != sum(map(_get_size, others)):
             return False
         cur_offset = 0
-        other_start: Tuple[int, ...] = tuple()
-        other_accessible: Tuple[int, ...] = tuple()
-        other_inaccessible: Tuple[int, ...] = tuple()
+        other_start: List[int] = []
+        other_accessible: List[int] = []
+        other_inaccessible: List[int] = []
         for other in others:
-
-            def displace(offsets: Tuple[int, ...]) -> Tuple[int, ...]:
-                return tuple(off + cur_offset for off in offsets)
-
-            other_start += displace(other.start_offsets())
-            other_accessible += displace(other.accessible_offsets())
-            other_inaccessible += displace(other.inaccessible_offsets())
+            other_start.extend(off + cur_offset for off in other.start_offsets())
+            other_accessible.extend(
+                off + cur_offset for off in other.accessible_offsets()
+            )
+            other_inaccessible.extend(
+                off + cur_offset for off in other.inaccessible_offsets()
+            )
+            cur_offset += other.size
+        self_start = self.start_offsets()
+        self_accessible = self.accessible_offsets()
+        self_inaccessible = self.inaccessible_offsets()
         return (
-            set(self.start_offsets()).issubset(other_start)
-            and self.accessible_offsets() == other_accessible
-            and self.inaccessible_offsets() == other_inaccessible
+            set(self_start).issubset(other_start)
+            and self_accessible == tuple(other_accessible)
+            and self_inaccessible == tuple(other_inaccessible)
         )
 
     @classmethod
-    def _from_json(cls, d: Dict[str, Any]) -> "TypeInfo":
+    def _from_json(cls, d: Encoded) -> "TypeInfo":
         """
-        Decodes from a dictionary
-        :param d: json as dict
+        Decodes from a list, or a dictionary in the previous format
+        :param d: json as list or dict
         :return: TypeInfo instance
         """
-        return cls(name=d["n"], size=d["s"])
+        if isinstance(d, list):
+            _, name, size = d
+        else:
+            name, size = d["n"], d["s"]
+        return _intern(cls(name=_intern_str(name), size=size))
 
-    def _to_json(self) -> Dict[str, Any]:
-        return {"T": 1, "n": self.name, "s": self.size}
+    def _to_json(self) -> List[Any]:
+        return [self.KIND, self.name, self.size]
 
     def __eq__(self, other: Any) -> bool:
         if isinstance(other, TypeInfo):
@@ -125,30 +193,43 @@ class TypeInfo:
 class Array(TypeInfo):
     """Stores information about an array"""
 
+    __slots__ = ("element_type", "element_size", "nelements", "_starts")
+
+    KIND = 2
+
     def __init__(self, *, nelements: int, element_size: int, element_type: str):
         self.element_type = element_type
         self.element_size = element_size
         self.nelements = nelements
         self.size = element_size * nelements
+        self._accessible: Optional[Tuple[int, ...]] = None
+        self._starts: Optional[Tuple[int, ...]] = None
 
     def start_offsets(self) -> Tuple[int, ...]:
         """
         For example, the type int[4] has start offsets [0, 4, 8, 12] (for 4-byte ints).
         :return: the start offsets elements in this array
         """
-        return tuple(range(self.size)[:: self.element_size])
+        if self._starts is None:
+            self._starts = _frange(self.size, self.element_size)
+        return self._starts
 
     @classmethod
-    def _from_json(cls, d: Dict[str, Any]) -> "Array":
-        return cls(nelements=d["n"], element_size=d["s"], element_type=d["t"])
+    def _from_json(cls, d: Encoded) -> "Array":
+        if isinstance(d, list):
+            _, nelements, element_size, element_type = d
+        else:
+            nelements, element_size, element_type = d["n"], d["s"], d["t"]
+        return _intern(
+            cls(
+                nelements=nelements,
+                element_size=element_size,
+                element_type=sys.intern(element_type),
+            )
+        )
 
-    def _to_json(self) -> Dict[str, Any]:
-        return {
-            "T": 2,
-            "n": self.nelements,
-            "s": self.element_size,
-            "t": self.element_type,
-        }
+    def _to_json(self) -> List[Any]:
+        return [self.KIND, self.nelements, self.element_size, self.element_type]
 
     def __eq__(self, other: Any) -> bool:
         if isinstance(other, Array):
@@ -183,17 +264,26 @@ class Pointer(TypeInfo):
     would recurse indefinitely.
     """
 
+    __slots__ = ("target_type_name",)
+
+    KIND = 3
     size = 8
+    _accessible = _frange(size)
 
     def __init__(self, target_type_name: str):
         self.target_type_name = target_type_name
 
+    def __reduce__(self) -> Tuple[Any, ...]:
+        # size is a class attribute, so the default slot state cannot be restored
+        return (self.__class__, (self.target_type_name,))
+
     @classmethod
-    def _from_json(cls, d: Dict[str, Any]) -> "Pointer":
-        return cls(d["t"])
+    def _from_json(cls, d: Encoded) -> "Pointer":
+        target_type_name = d[1] if isinstance(d, list) else d["t"]
+        return _intern(cls(sys.intern(target_type_name)))
 
-    def _to_json(self) -> Dict[str, Any]:
-        return {"T": 3, "t": self.target_type_name}
+    def _to_json(self) -> List[Any]:
+        return [self.KIND, self.target_type_name]
 
     def __eq__(self, other: Any) -> bool:
         if isinstance(other, Pointer):
@@ -211,17 +301,24 @@ class Pointer(TypeInfo):
 
 
 class Void(TypeInfo):
+    __slots__ = ()
+
+    KIND = 8
     size = 0
+    _accessible: Tuple[int, ...] = tuple()
 
     def __init__(self) -> None:
         pass
 
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return (self.__class__, ())
+
     @classmethod
-    def _from_json(cls, d: Dict[str, Any]) -> "Void":
-        return cls()
+    def _from_json(cls, d: Encoded) -> "Void":
+        return _intern(cls())
 
-    def _to_json(self) -> Dict[str, int]:
-        return {"T": 8}
+    def _to_json(self) -> List[int]:
+        return [self.KIND]
 
     def __eq__(self, other: Any) -> bool:
         return isinstance(other, Void)
@@ -236,17 +333,24 @@ class Void(TypeInfo):
 class Disappear(TypeInfo):
     """Target type for variables that don't appear in the ground truth function"""
 
+    __slots__ = ()
+
+    KIND = 10
     size = 0
+    _accessible: Tuple[int, ...] = tuple()
 
     def __init__(self) -> None:
         pass
 
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return (self.__class__, ())
+
     @classmethod
-    def _from_json(cls, d: Dict[str, Any]) -> "Disappear":
-        return cls()
+    def _from_json(cls, d: Encoded) -> "Disappear":
+        return _intern(cls())
 
-    def _to_json(self) -> Dict[str, int]:
-        return {"T": 10}
+    def _to_json(self) -> List[int]:
+        return [self.KIND]
 
     def __eq__(self, other: Any) -> bool:
         return isinstance(other, Disappear)
@@ -261,21 +365,29 @@ class Disappear(TypeInfo):
 class FunctionPointer(TypeInfo):
     """Stores information about a function pointer."""
 
-    size = Pointer.size
+    __slots__ = ()
+
+    KIND = 9
+    size = Pointer.size  # type: ignore
+    _accessible = _frange(size)
 
     def __init__(self, name: str):
         self.name = name
 
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return (self.__class__, (self.name,))
+
     def replacable_with(self, other: Tuple[TypeInfo, ...]) -> bool:
         # No function pointers are replacable for now
         return False
 
     @classmethod
-    def _from_json(cls, d: Dict[str, tUnion[str, int, None]]) -> "FunctionPointer":
-        return cls(d["n"])  # type: ignore
+    def _from_json(cls, d: Encoded) -> "FunctionPointer":
+        name = d[1] if isinstance(d, list) else d["n"]
+        return _intern(cls(sys.intern(name)))
 
-    def _to_json(self) -> Dict[str, Any]:
-        return {"T": 9, "n": self.name}
+    def _to_json(self) -> List[Any]:
+        return [self.KIND, self.name]
 
     def __eq__(self, other: Any) -> bool:
         if isinstance(other, FunctionPointer):
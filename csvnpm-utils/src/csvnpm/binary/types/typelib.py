@@ -2,14 +2,20 @@ import gzip
 import os
 import warnings
 from abc import ABC, abstractmethod, abstractstaticmethod
+from bisect import bisect_left, bisect_right
 from collections import defaultdict
-from json import JSONEncoder, dumps, loads
+from itertools import islice
+from multiprocessing import Pool
+from operator import attrgetter, methodcaller
 from typing import (
     Any,
+    BinaryIO,
+    Callable,
     DefaultDict,
     Dict,
     ItemsView,
     Iterable,
+    Iterator,
     KeysView,
     List,
     NamedTuple,
@@ -22,6 +28,7 @@ from typing import (
 from typing import Union as tUnion
 from typing import ValuesView
 
+import ijson
 from csvnpm.binary.types.member import Field, Member, Padding
 from csvnpm.binary.types.typeinfo import (
     Array,
@@ -32,7 +39,8 @@ from csvnpm.binary.types.typeinfo import (
     Void,
 )
 from csvnpm.binary.types.udt import Struct, Union
-from sortedcollections import ValueSortedDict
+from orjson import dumps, loads
+from sortedcontainers import SortedKeyList
 
 
 class Entry(NamedTuple):
@@ -59,19 +67,108 @@ class Entry(NamedTuple):
 
 T = TypeVar("T", bound="TypeLibABC")
 
+_get_size = attrgetter("size")
+_get_frequency = attrgetter("frequency")
+_get_accessible = methodcaller("accessible_offsets")
+_get_starts = methodcaller("start_offsets")
+
+
+def _open_json(path: str) -> BinaryIO:
+    """
+    Opens a JSON file for reading, decompressing it if it is gzipped
+    :param path: path of the plain or gzipped JSON file
+    :return: binary file object of the JSON text
+    """
+    with open(path, "rb") as f:
+        magic = f.read(2)
+    if magic == b"\x1f\x8b":
+        return gzip.open(path, "rb")  # type: ignore
+    return open(path, "rb")
+
+
+def _read_entries(json_file: str) -> Iterator[Tuple[int, List[Entry]]]:
+    """
+    Incrementally reads the entries of a serialized TypeLib
+    :param json_file: path of the plain or gzipped JSON file
+    :yields: pairs of size and the entries of that size
+    """
+    with _open_json(json_file) as f:
+        for key, lib_entry in ijson.kvitems(f, ""):
+            if key == "T":
+                continue
+            yield int(key), TypeLibCodec._decode_entries(lib_entry)
+
+
+def _parse_shard(json_file: str) -> List[Tuple[int, List[List[Any]]]]:
+    """
+    Parses a serialized TypeLib without decoding its types, for use in a
+    worker process. The types are decoded in the parent, so that equal types
+    from different shards are interned as one instance.
+
+    :param json_file: path of the plain or gzipped JSON file
+    :return: list of pairs of size and the parsed entries of that size
+    """
+    with _open_json(json_file) as f:
+        parsed = loads(f.read())
+    return [(int(key), entries) for key, entries in parsed.items() if key != "T"]
+
+
+def _concat_offsets(
+    types: Iterable[TypeInfo], offsets_of: Callable[[TypeInfo], Tuple[int, ...]]
+) -> List[int]:
+    """
+    Lays out types one after another and collects their offsets
+    :param types: iterable of type info
+    :param offsets_of: gets the offsets within a single type
+    :return: offsets of every type, relative to the start of the first
+    """
+    offset = 0
+    offsets: List[int] = []
+    for t in types:
+        # Shift the offsets with a C level map rather than a comprehension
+        offsets.extend(map(offset.__add__, offsets_of(t)))
+        offset += t.size
+    return offsets
+
+
+def _offsets_bitmap(offsets: Iterable[int]) -> int:
+    """
+    Packs a set of offsets into an integer with one bit set per offset
+    :param offsets: non-negative offsets
+    :return: bitmap of the offsets
+    """
+    bitmap = 0
+    for offset in offsets:
+        bitmap |= 1 << offset
+    return bitmap
+
 
 class EntryList:
     """A list of entries in the TypeLib. Each is list of Entries sorted by
     frequency.
     """
 
-    def __init__(self, data: List[Entry] = []):
-        # type is not subscriptable, real type is ValueSortedDict[TypeInfo, Entry]
-        self._data: ValueSortedDict = self._initialize_data(data)
+    def __init__(self, data: Optional[Iterable[Entry]] = None):
+        self._by_type: Dict[TypeInfo, Entry] = {}
+        # type is not subscriptable, real type is SortedKeyList[Entry]
+        self._sorted: SortedKeyList = SortedKeyList(key=_get_frequency)
+        if data is not None:
+            self._initialize_data(data)
 
-    @staticmethod
-    def _initialize_data(data: Iterable[Entry], freq: int = -1) -> ValueSortedDict:
-        return ValueSortedDict({t.typeinfo: t for t in data if t.frequency >= freq})
+    @classmethod
+    def _from_json(cls, entries: List[List[Any]]) -> "EntryList":
+        """
+        Decodes from the list of (frequency, typeinfo) pairs made by `_to_json`
+        :param entries: parsed JSON pairs of frequency and encoded typeinfo
+        :return: EntryList instance
+        """
+        return cls(TypeLibCodec._decode_entries(entries))
+
+    def _initialize_data(self, data: Iterable[Entry]):
+        # Later entries replace earlier ones of the same type
+        for entry in data:
+            self._by_type[entry.typeinfo] = entry
+        self._sorted.update(self._by_type.values())
 
     @property
     def frequency(self) -> int:
@@ -79,20 +176,27 @@ class EntryList:
         The total frequency for this entry list
         :return: the total of the frequencies for all entries in list
         """
-        return sum(c.frequency for c in self._data.values())
+        return sum(map(_get_frequency, self._sorted))
 
     def add_n(self, item: TypeInfo, n: int) -> bool:
         """
         Add n items, increasing frequency if it already exists.
         :param item: item to add
         :param n: count of item to add
-        :return: True if the item already existed during any of the adds
+        :return: True if the item already existed
         """
-        entry = self._data.get(item, Entry(0, item)).inc(n)
-        # this statement fits the comment, but is a code change
-        # exists = bool(entry.frequency > 1)
-        self._data[item] = entry
-        return True  # should return exists
+        existing = self._by_type.get(item)
+        if existing is None:
+            entry = Entry(n, item)
+            exists = False
+        else:
+            # Entries compare equal by type, so this removes exactly `existing`
+            self._sorted.remove(existing)
+            entry = existing.inc(n)
+            exists = True
+        self._by_type[item] = entry
+        self._sorted.add(entry)
+        return exists
 
     def add(self, item: TypeInfo) -> bool:
         """
@@ -124,28 +228,34 @@ class EntryList:
         :param item: type of item to retrieve frequency for
         :return: frequency if exists else `None`  # bad practice, should just return 0
         """
-        return self._data[item].freqency if item in self._data else None
+        entry = self._by_type.get(item)
+        return entry.frequency if entry is not None else None
 
     def sort(self):
         warnings.warn("structure is now always sorted", DeprecationWarning)
 
     def _to_json(self) -> List[Entry]:
-        return self._data
+        return list(self._sorted)
 
     def __iter__(self):
-        yield from self._data.values()
+        yield from self._sorted
 
     def __len__(self) -> int:
-        return len(self._data)
+        return len(self._by_type)
 
     def __getitem__(self, i: int) -> Entry:
-        return self._data.peekitem(i)[1]
+        return self._sorted[i]
 
     def __repr__(self) -> str:
-        return f"{[(entry) for entry in self._data.values()]}"
+        return f"{list(self._sorted)}"
 
     def prune(self, freq):
-        self._data = self._initialize_data(self._data.values(), freq=freq)
+        # Entries are sorted by increasing frequency, so the entries to remove
+        # are a prefix.
+        cut = self._sorted.bisect_key_left(freq)
+        for entry in self._sorted[:cut]:
+            del self._by_type[entry.typeinfo]
+        del self._sorted[:cut]
 
 
 class TypeLibABC(ABC):
@@ -168,7 +278,7 @@ class TypeLibABC(ABC):
         raise NotImplementedError
 
     @abstractmethod
-    def add_type(self, typ: Any, worklist: Set[str] = set()):
+    def add_type(self, typ: Any, worklist: Optional[Set[str]] = None):
         raise NotImplementedError
 
     def add_entry_list(self, size: int, entries: EntryList):
@@ -190,36 +300,40 @@ class TypeLibABC(ABC):
 
     def add_json_file(self, json_file: str, *, threads: int = 1):
         """
-        Adds the info in a serialized (gzipped) JSON file to this TypeLib
+        Adds the info in a serialized (optionally gzipped) JSON file to this
+        TypeLib. The file is parsed incrementally, one entry list at a time.
 
         :param json_file: string name of json file to process
         :param threads: unused number likely deprectated
         """
-        other: Optional[Any] = None
-        with open(json_file, "r") as other_file:
-            other = TypeLibCodec.decode(other_file.read())
-        if issubclass(type(other), TypeLibABC):
-            # not all codec types have `.__class__.items()`
-            for size, entries in other.items():  # type: ignore
-                self.add_entry_list(size, entries)
+        for size, entries in _read_entries(json_file):
+            self.add_entry_list(size, EntryList(entries))
 
     def sort(self):
         warnings.warn(
-            "structure is now always sorted, see `ValueSortedDict`", DeprecationWarning
+            "structure is now always sorted, see `EntryList`", DeprecationWarning
         )
 
     @classmethod
     def fix_bit(cls, typ):
         succeed = True
-        for m in typ.layout:
-            if isinstance(m, Field):
+        layout = list(typ.layout)
+        for i, m in enumerate(layout):
+            kind = m.KIND
+            if kind == Field.KIND:
                 succeed &= m.size % 8 == 0
                 if not succeed:
                     break
-                m.size //= 8
-            elif isinstance(m, Struct):
+                # Fields may be shared, see Field.make, so they are replaced
+                # rather than resized in place
+                layout[i] = Field.make(
+                    name=m.name, size=m.size // 8, type_name=m.type_name
+                )
+            elif kind == Struct.KIND:
                 succeed &= cls.fix_bit(m)
-        typ.size = sum(m.size for m in typ.layout)
+        typ.layout = tuple(layout)
+        typ.size = sum(map(_get_size, typ.layout))
+        typ._clear_cache()
         return succeed
 
     def fix(self) -> "TypeLibABC":
@@ -232,7 +346,7 @@ class TypeLibABC(ABC):
         for size in self.keys():
             for entry in self[size]:
                 succeed = True
-                if isinstance(entry.typeinfo, Struct):
+                if entry.typeinfo.KIND == Struct.KIND:
                     succeed &= cls.fix_bit(entry.typeinfo)
                     nsize = entry.typeinfo.size
                 else:
@@ -244,16 +358,29 @@ class TypeLibABC(ABC):
         return new_lib
 
     def make_cached_replacement_dict(self):
+        """
+        Index the types in the library by their memory layout. The layout is
+        keyed by bitmaps of the accessible and start offsets, see
+        `_offsets_bitmap`.
+        """
         self.cached_replacement_dict = defaultdict(set)
+        self._sorted_sizes = self._make_sorted_sizes()
         for size in self.keys():
             if size > 1024:
                 continue
             for entry in self[size]:
                 self.cached_replacement_dict[
-                    entry.typeinfo.accessible_offsets(),
-                    entry.typeinfo.start_offsets(),
+                    _offsets_bitmap(entry.typeinfo.accessible_offsets()),
+                    _offsets_bitmap(entry.typeinfo.start_offsets()),
                 ].add(entry.typeinfo)
 
+    def _make_sorted_sizes(self) -> List[int]:
+        """
+        :return: nonzero sizes in ascending order, for bisecting by remaining
+            length in `get_next_replacements`
+        """
+        return sorted(s for s in self.keys() if s != 0)
+
     def valid_layout_for_types(self, rest_a, rest_s, typs):
         for typ in typs:
             if len(rest_a) == 0:
@@ -288,6 +415,7 @@ class TypeLibABC(ABC):
 
         Notes:
         - The first start offset and accessible offset should be the same
+        - Both accessible and start_offsets must be sorted
         - The list returned is sorted by decreasing frequency in the library
 
         :param accessible: accessible (i.e., non-padding) addresses in memory
@@ -306,37 +434,45 @@ class TypeLibABC(ABC):
 
         # The last element of accessible is the last address in memory.
         length = (accessible[-1] - start) + 1
+        cache = self.cached_replacement_dict
+        # Layout relative to start, the layout of a candidate type of size n
+        # is the low n bits of these
+        accessible_bitmap = _offsets_bitmap(s - start for s in accessible)
+        start_bitmap = _offsets_bitmap(s - start for s in start_offsets)
+        accessible = tuple(accessible)
+        start_offsets = tuple(start_offsets)
+        n_accessible = len(accessible)
+        n_start = len(start_offsets)
         replacements = []
-        # Filter out types that are too long or of size zero
-        for size in filter(lambda s: s <= length and s != 0, self.keys()):
-            # Compute the memory layout of the remainder
-            rest_accessible: Tuple[int, ...] = tuple(
-                s for s in accessible if s >= (size + start)
-            )
-            rest_start: Tuple[int, ...] = tuple(
-                s for s in start_offsets if s >= (size + start)
-            )
-            # If the remainder of the start offsets is not either an empty tuple
-            # or if the first element of the new start offsets is not the same
-            # as the first member of the new accessible, this is not a legal
-            # size.
-            if len(rest_start) != 0 and (
-                len(rest_accessible) == 0 or rest_start[0] != rest_accessible[0]
+        sizes = getattr(self, "_sorted_sizes", None)
+        if sizes is None:
+            # The cache was set without the sizes, e.g. by unpickling
+            sizes = self._sorted_sizes = self._make_sorted_sizes()
+        # Filter out types that are too long, sizes are nonzero and sorted
+        for size in islice(sizes, bisect_right(sizes, length)):
+            end = size + start
+            # Split the layout at the end of the candidate type, everything
+            # from these indices on is the remainder
+            i_acc = bisect_left(accessible, end)
+            i_st = bisect_left(start_offsets, end)
+            # If the remainder of the start offsets is not either empty or if
+            # the first remaining start offset is not the same as the first
+            # remaining accessible offset, this is not a legal size.
+            if i_st != n_start and (
+                i_acc == n_accessible or start_offsets[i_st] != accessible[i_acc]
             ):
                 continue
             # If there are no more start offsets, but there are still accessible
             # offsets, this is not a legal replacement.
-            if len(rest_start) == 0 and len(rest_accessible) != 0:
+            if i_st == n_start and i_acc != n_accessible:
                 continue
-            shifted_cur_accessible = tuple(
-                s - start for s in accessible if s < (size + start)
+            rest_accessible = accessible[i_acc:]
+            rest_start = start_offsets[i_st:]
+            mask = (1 << size) - 1
+            # Use get() so that misses do not grow the defaultdict
+            typs: Set[TypeInfo] = cache.get(
+                (accessible_bitmap & mask, start_bitmap & mask), set()
             )
-            shifted_cur_start = tuple(
-                s - start for s in start_offsets if s < (size + start)
-            )
-            typs: Set[TypeInfo] = self.cached_replacement_dict[
-                shifted_cur_accessible, shifted_cur_start
-            ]
             replacements.append((typs, rest_accessible, rest_start))
         return replacements
         #  {typ.typeinfo: (a, s) for (typ, a, s) in replacements}
@@ -349,28 +485,18 @@ class TypeLibABC(ABC):
         :param types: iterable of type info
         :return: list of offsets for each type
         """
-        offset = 0
-        accessible = []
-        for t in types:
-            accessible += [offset + a for a in t.accessible_offsets()]
-            offset += t.size
-        return accessible
+        return _concat_offsets(types, _get_accessible)
 
     @staticmethod
     def start_offsets_of_types(types: Iterable[TypeInfo]) -> List[int]:
         """
-        Given a list of types, get the list of accessible offsets.
+        Given a list of types, get the list of start offsets.
         This is suitable for use with get_next_replacement.
 
         :param types: iterable of type info
         :return: list of offsets for each type
         """
-        offset = 0
-        start_offsets = []
-        for t in types:
-            start_offsets += [offset + s for s in t.start_offsets()]
-            offset += t.size
-        return start_offsets
+        return _concat_offsets(types, _get_starts)
 
     def items(self) -> ItemsView[int, "EntryList"]:
         return self._data.items()
@@ -386,7 +512,8 @@ class TypeLibABC(ABC):
         """
         Loads all the serialized (gzipped) JSON files in a directory
         :param path: string path of directory to load
-        :param threads: threads for multiprocessing
+        :param threads: processes that parse the files in parallel, the
+            types are still decoded and merged in this process
         :return: decoded TypeLibCodec
         """
         files = [
@@ -394,12 +521,19 @@ class TypeLibABC(ABC):
             for f in os.listdir(path)
             if os.path.isfile(os.path.join(path, f))
         ]
-        with gzip.open(files[0], "rt") as first_serialized:
+        with _open_json(files[0]) as first_serialized:
             new_lib = TypeLibCodec.decode(first_serialized.read())
 
         if isinstance(new_lib, cls):  # None is not a TypeLib
-            for f in files[1:]:
-                new_lib.add_json_file(f, threads=threads)
+            if threads > 1:
+                # Parse the shards in parallel, decoding and merging is serial
+                with Pool(threads) as pool:
+                    for shard in pool.imap(_parse_shard, files[1:]):
+                        for size, entries in shard:
+                            new_lib.add_entry_list(size, EntryList._from_json(entries))
+            else:
+                for f in files[1:]:
+                    new_lib.add_json_file(f)
         return new_lib
 
     @classmethod
@@ -410,18 +544,15 @@ class TypeLibABC(ABC):
         for key, lib_entry in d.items():
             if key == "T":
                 continue
-            entry_list: List[Entry] = [
-                Entry(frequency=f, typeinfo=ti) for (f, ti) in lib_entry
-            ]
-            data[int(key)] = EntryList(entry_list)
+            data[int(key)] = EntryList._from_json(lib_entry)
         return cls(data)
 
     def _to_json(self) -> Dict[Any, Any]:
         """Encodes as JSON
 
-        The 'T' field encodes which TypeInfo class is represented by this JSON:
-            E: EntryList
-            0: TypeLib
+        The TypeLib is a dict from size to EntryList, with its 'T' field set
+        to 0. Each EntryList is a list of [frequency, type] pairs. Types are
+        lists whose first element encodes which class they represent:
             1: TypeInfo
             2: Array
             3: Pointer
@@ -431,16 +562,9 @@ class TypeLibABC(ABC):
             7: Union
             8: Void
             9: FunctionPointer
+            10: Disappear
 
-            0: TypeInfo
-            1: Array
-            2: Pointer
-            3: UDT.Field
-            4: UDT.Padding
-            5: Struct
-            6: Union
-            7: Void
-            8: Function Pointer
+        Types encoded by older versions are dicts with the same tag in 'T'.
         :return: json struct as dict
         """
         encoded: Dict[Any, Any] = {
@@ -469,12 +593,11 @@ class TypeLibABC(ABC):
         return ret
 
     def prune(self, freq):
-        for key in self._data:
-            self._data[key].prune(freq)
-
-        for key, entry in self._data.items():
+        # Iterate over a snapshot, as emptied sizes are deleted along the way
+        for key, entry in list(self._data.items()):
+            entry.prune(freq)
             if len(entry) == 0:
-                self._data.pop(key)
+                del self._data[key]
 
 
 class TypelessTypeLib(TypeLibABC):
@@ -485,7 +608,7 @@ class TypelessTypeLib(TypeLibABC):
     def add_type(
         self,
         typ: Any,
-        worklist: Set[str] = set(),
+        worklist: Optional[Set[str]] = None,
     ):
         return None
 
@@ -507,18 +630,27 @@ class TypeLibCodec:
     ] = {
         "E": EntryList,
         _typelib_key: TypelessTypeLib,
-        1: TypeInfo,
-        2: Array,
-        3: Pointer,
-        4: Field,
-        5: Padding,
-        6: Struct,
-        7: Union,
-        8: Void,
-        9: FunctionPointer,
-        10: Disappear,
+        # Each class is tagged by its KIND, which its _to_json also writes
+        **{
+            c.KIND: c
+            for c in (
+                TypeInfo,
+                Array,
+                Pointer,
+                Field,
+                Padding,
+                Struct,
+                Union,
+                Void,
+                FunctionPointer,
+                Disappear,
+            )
+        },
     }
 
+    # `_from_json` of each integer-tagged class, indexed by tag
+    _decoders: List[Callable[[Any], CodecTypes]] = []
+
     def __init__(self, typelib: Type[TypeLibABC] = TypelessTypeLib):
         self.set_typelib(typelib)
 
@@ -526,27 +658,68 @@ class TypeLibCodec:
     def set_typelib(cls, typelib: Type[TypeLibABC]):
         assert issubclass(typelib, TypeLibABC)
         cls._classes[cls._typelib_key] = typelib
+        cls._update_decoders()
         return True
 
+    @classmethod
+    def _update_decoders(cls):
+        """Rebuild the tag-indexed decoder table from `_classes`"""
+        tags = [tag for tag in cls._classes if isinstance(tag, int)]
+        cls._decoders = [
+            cls._classes[tag]._from_json for tag in range(max(tags) + 1)  # type: ignore
+        ]
+
     @staticmethod
-    def decode(encoded: str) -> CodecTypes:
+    def decode(encoded: tUnion[str, bytes]) -> CodecTypes:
         """
         :param encoded: string representation of encoded TypeLibCodec
         :return: Decodes a JSON string
         """
-        return loads(encoded, object_hook=TypeLibCodec.read_metadata)
+        return TypeLibCodec.decode_parsed(loads(encoded))
+
+    @staticmethod
+    def decode_parsed(parsed: Any) -> CodecTypes:
+        """
+        Same as `decode`, for JSON that was already parsed as part of a
+        larger document, which saves serializing it again.
+
+        :param parsed: JSON parsed into lists and dicts
+        :return: Decodes parsed JSON
+        """
+        if type(parsed) is list:
+            return TypeLibCodec._decoders[parsed[0]](parsed)
+        return TypeLibCodec.read_metadata(parsed)
+
+    @classmethod
+    def _decode_entries(cls, entries: List[List[Any]]) -> List[Entry]:
+        """
+        :param entries: parsed JSON of an EntryList
+        :return: entries with decoded types
+        """
+        decoders = cls._decoders
+        return [
+            Entry(
+                freq,
+                decoders[ti[0]](ti)  # type: ignore
+                if type(ti) is list
+                else cls.read_metadata(ti),
+            )
+            for (freq, ti) in entries
+        ]
 
     @classmethod
     def read_metadata(cls, d: Dict[str, Any]) -> "TypeLibCodec.CodecTypes":
-        return cls._classes[d["T"]]._from_json(d)  # type: ignore
+        """
+        Decodes a dictionary tagged by "T". Each class decodes the encoded
+        objects it contains itself, e.g. a Struct decodes its layout.
 
-    class _Encoder(JSONEncoder):
-        def default(self, obj: Any) -> Any:
-            if hasattr(obj, "_to_json"):
-                return obj._to_json()
-            if isinstance(obj, set):
-                return list(obj)
-            return super().default(obj)
+        :param d: parsed JSON dictionary
+        :return: decoded instance of the tagged class
+        """
+        tag = d["T"]
+        if type(tag) is int:
+            return cls._decoders[tag](d)
+        return cls._classes[tag]._from_json(d)  # type: ignore
 
     @staticmethod
     def encode(o: CodecTypes) -> str:
@@ -554,5 +727,41 @@ class TypeLibCodec:
         :param o: instance of code cype
         :return: Encodes a TypeLib or TypeInfo as JSON
         """
-        # 'separators' removes spaces after , and : for efficiency
-        return dumps(o, cls=TypeLibCodec._Encoder, separators=(",", ":"))
+        return dumps(o, default=_encode_default).decode()
+
+    @staticmethod
+    def dump(o: CodecTypes, fp: BinaryIO) -> None:
+        """
+        Encodes as JSON into a binary file. TypeLibs are written one entry
+        list at a time, so the whole encoding is never held in memory.
+
+        :param o: instance of code cype
+        :param fp: file opened for writing bytes
+        """
+        if not isinstance(o, TypeLibABC):
+            fp.write(dumps(o, default=_encode_default))
+            return
+        fp.write(b"{")
+        for key, entries in o.items():
+            fp.write(b'"%d":' % key)
+            fp.write(dumps(entries, default=_encode_default))
+            fp.write(b",")
+        fp.write(b'"T":%d}' % TypeLibCodec._typelib_key)
+
+
+def _encode_default(obj: Any) -> Any:
+    """
+    Serializes the objects orjson does not handle natively
+    :param obj: object to serialize
+    :raises TypeError: obj is not serializable
+    :return: JSON serializable representation of obj
+    """
+    if hasattr(obj, "_to_json"):
+        return obj._to_json()
+    if isinstance(obj, (set, tuple)):
+        # NamedTuples such as Entry are not serialized natively
+        return list(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+TypeLibCodec._update_decoders()
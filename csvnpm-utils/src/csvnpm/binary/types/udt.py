@@ -1,8 +1,14 @@
-from typing import Any, Dict, Iterable, List, Optional, Tuple, TypeVar
+from typing import Any, Iterable, List, Optional, Tuple, TypeVar
 from typing import Union as tUnion
 
 from csvnpm.binary.types.member import Field, Member, Padding
-from csvnpm.binary.types.typeinfo import TypeInfo
+from csvnpm.binary.types.typeinfo import (
+    Encoded,
+    TypeInfo,
+    _frange,
+    _get_size,
+    _intern_str,
+)
 
 _T = TypeVar("_T")
 
@@ -10,6 +16,8 @@ _T = TypeVar("_T")
 class UDT(TypeInfo):
     """An object representing struct or union types"""
 
+    __slots__ = ()
+
     def __init__(self) -> None:
         raise NotImplementedError
 
@@ -17,6 +25,10 @@ class UDT(TypeInfo):
 class Union(UDT):
     """Stores information about a union"""
 
+    __slots__ = ("members", "padding", "_max_member_size")
+
+    KIND = 7
+
     def __init__(
         self,
         *,
@@ -28,10 +40,8 @@ class Union(UDT):
         self.members = tuple(members)
         self.padding = padding
         # Set size to 0 if there are no members
-        try:
-            self.size = max(m.size for m in members)
-        except ValueError:
-            self.size = 0
+        self._max_member_size = max((m.size for m in self.members), default=0)
+        self.size = self._max_member_size
         if self.padding is not None:
             self.size += self.padding.size
 
@@ -45,7 +55,7 @@ class Union(UDT):
         """
         :return: Offsets accessible in this Union
         """
-        return tuple(range(max(m.size for m in self.members)))
+        return _frange(self._max_member_size)
 
     def inaccessible_offsets(self) -> Tuple[int, ...]:
         """
@@ -53,7 +63,7 @@ class Union(UDT):
         """
         if not self.has_padding():
             return tuple()
-        return tuple(range(max(m.size for m in self.members), self.size))
+        return tuple(range(self._max_member_size, self.size))
 
     def start_offsets(self) -> Tuple[int, ...]:
         """
@@ -62,16 +72,24 @@ class Union(UDT):
         return (0,)
 
     @classmethod
-    def _from_json(cls, d: Dict[str, Any]) -> "Union":
-        return cls(name=d["n"], members=d["m"], padding=d["p"])
+    def _from_json(cls, d: Encoded) -> "Union":
+        if isinstance(d, list):
+            _, name, members, padding = d
+        else:
+            name, members, padding = d["n"], d["m"], d["p"]
+        return cls(
+            name=_intern_str(name),
+            members=map(_decode_member, members),
+            padding=Padding._from_json(padding) if padding is not None else None,
+        )
 
-    def _to_json(self) -> Dict[str, Any]:
-        return {
-            "T": 8,
-            "n": self.name,
-            "m": [m._to_json() for m in self.members],
-            "p": self.padding,
-        }
+    def _to_json(self) -> List[Any]:
+        return [
+            self.KIND,
+            self.name,
+            [m._to_json() for m in self.members],
+            self.padding._to_json() if self.padding is not None else None,
+        ]
 
     def __eq__(self, other: Any) -> bool:
         if isinstance(other, Union):
@@ -86,16 +104,12 @@ class Union(UDT):
         return hash((self.name, self.members, self.padding))
 
     def __str__(self) -> str:
-        if self.name is None:
-            ret = "union {{ "
-        else:
-            ret = f"union {self.name} {{ "
-        for m in self.members:
-            ret += f"{str(m)}; "
+        parts = ["union {{ " if self.name is None else f"union {self.name} {{ "]
+        parts.extend(f"{m}; " for m in self.members)
         if self.padding is not None:
-            ret += f"{str(self.padding)}; "
-        ret += "}"
-        return ret
+            parts.append(f"{self.padding}; ")
+        parts.append("}")
+        return "".join(parts)
 
     def tokenize(self) -> List[str]:
         raise NotImplementedError
@@ -104,6 +118,10 @@ class Union(UDT):
 class Struct(UDT):
     """Stores information about a struct"""
 
+    __slots__ = ("layout", "_has_padding", "_inaccessible", "_starts")
+
+    KIND = 6
+
     def __init__(
         self,
         *,
@@ -112,43 +130,53 @@ class Struct(UDT):
     ):
         self.name = name
         self.layout = tuple(layout)
-        self.size = sum(lay.size for lay in layout)
+        self.size = sum(map(_get_size, self.layout))
+        self._has_padding = any(isinstance(m, Padding) for m in self.layout)
+        self._clear_cache()
+
+    def _clear_cache(self) -> None:
+        """Forget the computed offsets, for when member sizes change"""
+        self._accessible: Optional[Tuple[int, ...]] = None
+        self._inaccessible: Optional[Tuple[int, ...]] = None
+        self._starts: Optional[Tuple[int, ...]] = None
 
     def has_padding(self) -> bool:
         """
         :return: True if the Struct has padding
         """
-        return any((isinstance(m, Padding) for m in self.layout))
+        return self._has_padding
 
     def accessible_offsets(self) -> Tuple[int, ...]:
         """
         :return: Offsets accessible in this struct
         """
-        accessible: Tuple[int, ...] = tuple()
+        if self._accessible is None:
+            self._accessible = self._offsets_of(Field)
+        return self._accessible
+
+    def _offsets_of(self, kind: type) -> Tuple[int, ...]:
+        """
+        :param kind: class of the members to collect
+        :return: Offsets covered by members of that class
+        """
+        offsets: List[int] = []
         current_offset = 0
         for m in self.layout:
             next_offset = current_offset + m.size
-            if isinstance(m, Field):
-                for offset in range(current_offset, next_offset):
-                    accessible += (offset,)
+            if isinstance(m, kind):
+                offsets.extend(range(current_offset, next_offset))
             current_offset = next_offset
-        return accessible
+        return tuple(offsets)
 
     def inaccessible_offsets(self) -> Tuple[int, ...]:
         """
         :return: Offsets inaccessible in this struct
         """
-        if not self.has_padding():
+        if not self._has_padding:
             return tuple()
-        inaccessible: Tuple[int, ...] = tuple()
-        current_offset = 0
-        for m in self.layout:
-            next_offset = current_offset + m.size
-            if isinstance(m, Padding):
-                for offset in range(current_offset, next_offset):
-                    inaccessible += (offset,)
-            current_offset = next_offset
-        return inaccessible
+        if self._inaccessible is None:
+            self._inaccessible = self._offsets_of(Padding)
+        return self._inaccessible
 
     def start_offsets(self) -> Tuple[int, ...]:
         """
@@ -160,24 +188,26 @@ class Struct(UDT):
             [int, char, padding(3), long, long]
             has offsets [0, 4, 8, 16].
         """
-        starts: Tuple[int, ...] = tuple()
-        current_offset = 0
-        for m in self.layout:
-            if isinstance(m, Field):
-                starts += (current_offset,)
-            current_offset += m.size
-        return starts
+        if self._starts is None:
+            starts: List[int] = []
+            current_offset = 0
+            for m in self.layout:
+                if isinstance(m, Field):
+                    starts.append(current_offset)
+                current_offset += m.size
+            self._starts = tuple(starts)
+        return self._starts
 
     @classmethod
-    def _from_json(cls, d: Dict[str, Any]) -> "Struct":
-        return cls(name=d["n"], layout=d["l"])
+    def _from_json(cls, d: Encoded) -> "Struct":
+        if isinstance(d, list):
+            _, name, layout = d
+        else:
+            name, layout = d["n"], d["l"]
+        return cls(name=_intern_str(name), layout=map(_decode_member, layout))
 
-    def _to_json(self) -> Dict[str, Any]:
-        return {
-            "T": 6,
-            "n": self.name,
-            "l": [lay._to_json() for lay in self.layout],
-        }
+    def _to_json(self) -> List[Any]:
+        return [self.KIND, self.name, [lay._to_json() for lay in self.layout]]
 
     def __eq__(self, other: Any) -> bool:
         if isinstance(other, Struct):
@@ -188,14 +218,10 @@ class Struct(UDT):
         return hash((self.name, self.layout))
 
     def __str__(self) -> str:
-        if self.name is None:
-            ret = "struct {{ "
-        else:
-            ret = f"struct {self.name} {{ "
-        for lay in self.layout:
-            ret += f"{str(lay)}; "
-        ret += "}"
-        return ret
+        parts = ["struct {{ " if self.name is None else f"struct {self.name} {{ "]
+        parts.extend(f"{lay}; " for lay in self.layout)
+        parts.append("}")
+        return "".join(parts)
 
     def tokenize(self) -> List[str]:
         return (
@@ -203,3 +229,15 @@ class Struct(UDT):
             + [str(lay) for lay in self.layout]
             + ["<eot>"]
         )
+
+
+# `_from_json` of the classes that can be members of a UDT, keyed by tag
+_MEMBER_DECODERS = {c.KIND: c._from_json for c in (Field, Padding, Struct, Union)}
+
+
+def _decode_member(d: Encoded) -> Any:
+    """
+    :param d: a member of a UDT, encoded as a list or a dictionary
+    :return: the decoded Field, Padding, Struct or Union
+    """
+    return _MEMBER_DECODERS[d[0] if isinstance(d, list) else d["T"]](d)
@@ -1,7 +1,5 @@
 """Information about variables in a function"""
 
-from json import dumps
-
 from csvnpm.binary.types.typeinfo import TypeInfo
 from csvnpm.binary.types.typelib import TypeLibCodec
 
@@ -94,7 +92,7 @@ class Variable:
 
     @classmethod
     def from_json(cls, d):
-        typ = TypeLibCodec.decode(dumps(d["t"]))
+        typ = TypeLibCodec.decode_parsed(d["t"])
         return cls(typ=typ, name=d["n"], user=d["u"])
 
     def __eq__(self, other) -> bool:
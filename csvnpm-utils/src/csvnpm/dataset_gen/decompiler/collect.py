@@ -1,14 +1,21 @@
-import gzip
 import os
 from collections import defaultdict
-from typing import DefaultDict, Iterable, Optional, Set
+from concurrent.futures import ThreadPoolExecutor
+from typing import DefaultDict, Dict, Iterable, List, Optional, Set, Tuple
 
 from csvnpm.binary.types.typeinfo import TypeInfo
 from csvnpm.binary.types.typelib import TypeLibCodec
+from csvnpm.binary.types.udt import UDT
 from csvnpm.binary.variable import Location, Register, Stack, Variable
 from csvnpm.ida import idaapi as ida
 from csvnpm.ida.ida_typelib import TypeLib
 
+try:
+    # Faster drop-in replacement for gzip, when installed
+    from isal import igzip as gzip
+except ModuleNotFoundError:
+    import gzip  # type: ignore[no-redef]
+
 
 class Collector(ida.action_handler_t):
     """Generic class to collect information from a binary"""
@@ -21,22 +28,61 @@ class Collector(ida.action_handler_t):
             os.environ["PREFIX"] + ".json.gz",
         )
         try:
-            with gzip.open(self.type_lib_file_name, "rt") as type_lib_file:
-                self.type_lib = TypeLibCodec.decode(type_lib_file.read())
+            # Parsed incrementally, rather than decoding the whole file at once
+            self.type_lib = TypeLib()
+            self.type_lib.add_json_file(self.type_lib_file_name)
         except Exception as e:
             print(e)
             print("Could not find type library, creating a new one")
             self.type_lib = TypeLib()
+        # IDA's API is not generally safe to call off the main thread, so
+        # parsing types in a thread pool has to be enabled explicitly
+        self.parse_threads = int(os.environ.get("PARSE_THREADS", "0"))
+        # Parsed types by name, most variables share a few types. UDTs are not
+        # cached since TypeLibABC.fix_bit modifies them in place.
+        self._parse_cache: Dict[str, TypeInfo] = {}
         super().__init__()
 
-    def write_type_lib(self) -> None:
+    def _parse_type(self, typ: ida.tinfo_t) -> TypeInfo:
+        """
+        Parses an IDA tinfo_t object, reusing the result for non-UDT types of
+        the same name
+
+        :param typ: type as defined by ida
+        :return: parsed type, see `TypeLib.parse_type`
+        """
+        type_name = typ.dstr()
+        parsed = self._parse_cache.get(type_name)
+        if parsed is None:
+            parsed = TypeLib.parse_type(typ)
+            if not isinstance(parsed, UDT):
+                self._parse_cache[type_name] = parsed
+        return parsed
+
+    def _parse_types(
+        self, variables: List[Tuple[ida.lvar_t, ida.tinfo_t]]
+    ) -> List[TypeInfo]:
+        """
+        Parses the types of variables, in a thread pool if PARSE_THREADS is set
+
+        :param variables: pairs of variables and their types as defined by ida
+        :return: the parsed type of each variable
+        """
+        if self.parse_threads <= 1:
+            return [self._parse_type(t) for _, t in variables]
+        with ThreadPoolExecutor(self.parse_threads) as pool:
+            return list(pool.map(lambda vt: self._parse_type(vt[1]), variables))
+
+    def write_type_lib(self, compresslevel: int = 1) -> None:
         """Dumps the type library to the file specified by the environment variable
         `TYPE_LIB`.
+
+        :param compresslevel: gzip compression level, the default favors speed
         """
-        with gzip.open(self.type_lib_file_name, "wt") as type_lib_file:
-            encoded = TypeLibCodec.encode(self.type_lib)
-            type_lib_file.write(encoded)
-            type_lib_file.flush()
+        with gzip.open(
+            self.type_lib_file_name, "wb", compresslevel=compresslevel
+        ) as type_lib_file:
+            TypeLibCodec.dump(self.type_lib, type_lib_file)
 
     def collect_variables(
         self,
@@ -54,12 +100,18 @@ class Collector(ida.action_handler_t):
         :return: mapping of location to csvnom variables for operation with models
         """
         collected_vars: DefaultDict[Location, Set[Variable]] = defaultdict(set)
+        named: List[Tuple[ida.lvar_t, ida.tinfo_t]] = []
         for v in variables:
-            if v.name == "" or not v.type():
+            if v.name == "":
                 continue
+            # IDA allocates a new tinfo_t on every call to type()
+            ida_type = v.type()
+            if ida_type:
+                named.append((v, ida_type))
+        # Only parsing may run in parallel, the type library is updated serially
+        for (v, ida_type), typ in zip(named, self._parse_types(named)):
             # Add all types to the typelib
-            self.type_lib.add_ida_type(v.type())
-            typ: TypeInfo = TypeLib.parse_type(v.type())
+            self.type_lib.add_type(ida_type)
 
             loc: Optional[Location] = None
             if v.is_stk_var():
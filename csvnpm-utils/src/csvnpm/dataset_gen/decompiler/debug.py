@@ -48,7 +48,7 @@ class CollectDebug(Collector):
 
             # Function info
             name: str = ida.get_func_name(ea)
-            self.type_lib.add_ida_type(cfunc.type.get_rettype())
+            self.type_lib.add_type(cfunc.type.get_rettype())
             return_type = TypeLib.parse_type(cfunc.type.get_rettype())
 
             arguments = self.collect_variables(
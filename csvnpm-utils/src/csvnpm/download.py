@@ -1,34 +1,104 @@
 import argparse
 import os
+import random
 import shutil
 import time
+from concurrent.futures import ThreadPoolExecutor
 from functools import partial
 
 import requests
 import tqdm
+import urllib3
 
+CHUNK_SIZE = 1 << 20
+# Number of chunks read between progress bar updates
+PBAR_CHUNKS = 16
+# Only files larger than this are downloaded over parallel connections
+PARALLEL_MIN_SIZE = 64 << 20
 
-def download(url, path, fname, redownload=False):
+
+def _download_ranges(url, outfile, size, workers, pbar):
+    """
+    Downloads a file as byte ranges over parallel connections, each written
+    in place into a file of the full size.
+
+    :param url: string url to download from
+    :param outfile: destination file path
+    :param size: size of the file in bytes
+    :param workers: number of connections
+    :param pbar: progress bar to update
+    :raises ConnectionError: a range was not served completely
+    """
+    step = -(-size // workers)
+
+    def fetch(start):
+        end = min(start + step, size)
+        headers = {
+            "Range": "bytes=%d-%d" % (start, end - 1),
+            "Accept-Encoding": "identity",
+        }
+        with requests.get(url, stream=True, timeout=5, headers=headers) as response:
+            if response.status_code != 206:
+                raise requests.exceptions.ConnectionError(
+                    "Range request returned %d" % response.status_code
+                )
+            offset = start
+            pending = 0
+            nchunks = 0
+            while offset < end:
+                chunk = response.raw.read(CHUNK_SIZE, decode_content=False)
+                if not chunk:
+                    break
+                os.pwrite(fd, chunk, offset)
+                offset += len(chunk)
+                pending += len(chunk)
+                nchunks += 1
+                if nchunks % PBAR_CHUNKS == 0:
+                    pbar.update(pending)
+                    pending = 0
+            pbar.update(pending)
+        if offset != end:
+            raise requests.exceptions.ConnectionError(
+                "Range %d-%d ended at %d" % (start, end - 1, offset)
+            )
+
+    with open(outfile, "wb") as f:
+        f.truncate(size)
+        fd = f.fileno()
+        with ThreadPoolExecutor(workers) as pool:
+            # Consume the results to raise any errors
+            for _ in pool.map(fetch, range(0, size, step)):
+                pass
+
+
+def download(url, path, fname, redownload=False, parallel=4):
     """
     Downloads file using `requests`. If ``redownload`` is set to false, then
     will not download tar file again if it is present (default ``True``).
 
+    Large files are downloaded over ``parallel`` connections if the server
+    supports range requests.
+
     :param url: string of base url to download from
     :param path: string of base directory to save
     :param fname: destination filename
     :param redownload: checks if file already exists, defaults to False
+    :param parallel: number of connections for large files, defaults to 4
     :raises RuntimeWarning: Interrupted Network Connection
     :raises RuntimeWarning: wrong download payload size
     """
     outfile = os.path.join(path, fname)
     download = not os.path.isfile(outfile) or redownload
     print("[ downloading: " + url + " to " + outfile + " ]")
-    retry = 5
-    exp_backoff = [2 ** r for r in reversed(range(retry))]
+    retries = 5
+    # Number of failed attempts so far
+    attempt = 0
+    # Cleared if the server fails range requests despite advertising them
+    use_ranges = parallel > 1 and hasattr(os, "pwrite")
 
     pbar = tqdm.tqdm(unit="B", unit_scale=True, desc="Downloading {}".format(fname))
 
-    while download and retry >= 0:
+    while download and attempt <= retries:
         resume_file = outfile + ".part"
         resume = os.path.isfile(resume_file)
         if resume:
@@ -41,14 +111,10 @@ def download(url, path, fname, redownload=False):
 
         with requests.Session() as session:
             try:
-                header = (
-                    {
-                        "Range": "bytes=%d-" % resume_pos,
-                        "Accept-Encoding": "identity",
-                    }
-                    if resume
-                    else {}
-                )
+                # The body is saved as sent, so it must not be compressed
+                header = {"Accept-Encoding": "identity"}
+                if resume:
+                    header["Range"] = "bytes=%d-" % resume_pos
                 response = session.get(url, stream=True, timeout=5, headers=header)
 
                 # negative reply could be 'none' or just missing
@@ -56,40 +122,82 @@ def download(url, path, fname, redownload=False):
                     resume_pos = 0
                     mode = "wb"
 
-                CHUNK_SIZE = 32768
                 total_size = int(response.headers.get("Content-Length", -1))
                 # server returns remaining size if resuming, so adjust total
                 total_size += resume_pos
                 pbar.total = total_size
                 done = resume_pos
 
+                if (
+                    not resume
+                    and use_ranges
+                    and response.headers.get("Accept-Ranges") == "bytes"
+                    and total_size > PARALLEL_MIN_SIZE
+                ):
+                    response.close()
+                    try:
+                        _download_ranges(url, resume_file, total_size, parallel, pbar)
+                    except BaseException as e:
+                        # The file has holes, so it cannot be resumed
+                        if os.path.isfile(resume_file):
+                            os.remove(resume_file)
+                        pbar.reset()
+                        if not isinstance(
+                            e,
+                            (
+                                requests.exceptions.RequestException,
+                                urllib3.exceptions.HTTPError,
+                            ),
+                        ):
+                            raise
+                        print("Range requests failed, downloading over one connection.")
+                        use_ranges = False
+                        continue
+                    done = total_size
+                    break
+
+                # Reading the raw stream skips iter_content's per chunk overhead
+                raw = response.raw
                 with open(resume_file, mode) as f:
-                    for chunk in response.iter_content(CHUNK_SIZE):
-                        if chunk:  # filter out keep-alive new chunks
-                            f.write(chunk)
-                        if total_size > 0:
-                            done += len(chunk)
+                    pending = 0
+                    nchunks = 0
+                    while True:
+                        chunk = raw.read(CHUNK_SIZE, decode_content=False)
+                        if not chunk:
+                            break
+                        f.write(chunk)
+                        done += len(chunk)
+                        pending += len(chunk)
+                        nchunks += 1
+                        if nchunks % PBAR_CHUNKS == 0:
                             if total_size < done:
                                 # don't freak out if content-length was too small
                                 total_size = done
                                 pbar.total = total_size
-                            pbar.update(len(chunk))
+                            pbar.update(pending)
+                            pending = 0
+                    pbar.update(pending)
                     break
-            except requests.exceptions.ConnectionError:
-                retry -= 1
+            except (requests.exceptions.ConnectionError, urllib3.exceptions.HTTPError):
+                attempt += 1
                 pbar.clear()
-                if retry >= 0:
-                    print("Connection error, retrying. (%d retries left)" % retry)
-                    time.sleep(exp_backoff[retry])
+                if attempt <= retries:
+                    print(
+                        "Connection error, retrying. (%d retries left)"
+                        % (retries - attempt)
+                    )
+                    # Back off exponentially, with jitter so that clients that
+                    # failed together do not retry together
+                    time.sleep(min(2 ** attempt, 60) * (0.5 + random.random()))
                 else:
                     print("Retried too many times, stopped retrying.")
             finally:
                 if response:
                     response.close()
-    if retry < 0:
+    if attempt > retries:
         raise RuntimeWarning("Connection broken too many times. Stopped retrying.")
 
-    if download and retry > 0:
+    if download:
         pbar.update(done - pbar.n)
         if done < total_size:
             raise RuntimeWarning(
@@ -120,6 +228,7 @@ def download_from_google_drive(gd_id, destination):
     URL = "https://docs.google.com/uc?export=download"
 
     with requests.Session() as session:
+        session.headers["Accept-Encoding"] = "identity"
         response = session.get(URL, params={"id": gd_id}, stream=True)
         token = _get_confirm_token(response)
 
@@ -128,13 +237,18 @@ def download_from_google_drive(gd_id, destination):
             params = {"id": gd_id, "confirm": token}
             response = session.get(URL, params=params, stream=True)
 
-        CHUNK_SIZE = 32768
-        with open(destination, "wb") as f:
-            for chunk in tqdm.tqdm(
-                response.iter_content(CHUNK_SIZE), desc="Downloading"
-            ):
-                if chunk:  # filter out keep-alive new chunks
-                    f.write(chunk)
+        total_size = int(response.headers.get("Content-Length", 0))
+        raw = response.raw
+        with open(destination, "wb") as f, tqdm.tqdm(
+            total=total_size or None, unit="B", unit_scale=True, desc="Downloading"
+        ) as pbar:
+            while True:
+                # decoded only if the server compressed the body regardless
+                chunk = raw.read(CHUNK_SIZE, decode_content=True)
+                if not chunk:
+                    break
+                f.write(chunk)
+                pbar.update(len(chunk))
         response.close()
 
 
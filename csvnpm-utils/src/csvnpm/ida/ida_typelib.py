@@ -1,14 +1,19 @@
-from typing import List, Set
+from typing import DefaultDict, List, Optional, Set
 from typing import Union as tUnion
 
 from csvnpm.binary.types.member import Field, Member
 from csvnpm.binary.types.typeinfo import Array, FunctionPointer, Pointer, Void
-from csvnpm.binary.types.typelib import TypeInfo, TypeLibABC
+from csvnpm.binary.types.typelib import EntryList, TypeInfo, TypeLibABC
 from csvnpm.binary.types.udt import Padding, Struct, Union
 from csvnpm.ida import ida_typeinf
 
 
 class TypeLib(TypeLibABC):
+    def __init__(self, data: Optional[DefaultDict[int, EntryList]] = None):
+        super().__init__(data)
+        # Names of the types added by add_type, including nested types
+        self._seen: Set[str] = set()
+
     @staticmethod
     def parse_type(typ: ida_typeinf.tinfo_t) -> TypeInfo:  # type: ignore
         """
@@ -19,8 +24,9 @@ class TypeLib(TypeLibABC):
         """
         if typ.is_void():
             return Void()
-        if typ.is_funcptr() or "(" in typ.dstr():
-            return FunctionPointer(name=typ.dstr())
+        type_name = typ.dstr()
+        if typ.is_funcptr() or "(" in type_name:
+            return FunctionPointer(name=type_name)
         if typ.is_decl_ptr():
             return Pointer(typ.get_pointed_object().dstr())
         if typ.is_array():
@@ -41,27 +47,28 @@ class TypeLib(TypeLibABC):
         if typ.is_udt():
             udt_info = ida_typeinf.udt_type_data_t()
             typ.get_udt_details(udt_info)
-            name = typ.dstr()
+            name = type_name
             size = udt_info.total_size
             nmembers = typ.get_udt_nmembers()
+            # find_udt_member overwrites the member in place, so one is reused
+            member = ida_typeinf.udt_member_t()
             if typ.is_union():
-                members = []
-                largest_size = 0
+                names: List[str] = []
+                sizes: List[int] = []
+                type_names: List[str] = []
                 for n in range(nmembers):
-                    member = ida_typeinf.udt_member_t()
                     # To get the nth member set OFFSET to n and tell find_udt_member
                     # to search by index.
                     member.offset = n
                     typ.find_udt_member(member, ida_typeinf.STRMEM_INDEX)
-                    largest_size = max(largest_size, member.size)
-                    type_name = member.type.dstr()
-                    members.append(
-                        Field(
-                            name=member.name,
-                            size=member.size,
-                            type_name=type_name,
-                        )
-                    )
+                    names.append(member.name)
+                    sizes.append(member.size)
+                    type_names.append(member.type.dstr())
+                members = [
+                    Field.make(name=m_name, size=m_size, type_name=m_type_name)
+                    for m_name, m_size, m_type_name in zip(names, sizes, type_names)
+                ]
+                largest_size = max(sizes, default=0)
                 end_padding = size - (largest_size // 8)
                 if end_padding == 0:
                     return Union(name=name, members=members)
@@ -75,7 +82,6 @@ class TypeLib(TypeLibABC):
                 layout: List[tUnion[Member, Struct, Union]] = []
                 next_offset = 0
                 for n in range(nmembers):
-                    member = ida_typeinf.udt_member_t()
                     member.offset = n
                     typ.find_udt_member(member, ida_typeinf.STRMEM_INDEX)
                     # Check for padding. Careful, because offset and
@@ -83,12 +89,11 @@ class TypeLib(TypeLibABC):
                     if member.offset != next_offset:
                         layout.append(Padding((member.offset - next_offset) // 8))
                     next_offset = member.offset + member.size
-                    type_name = member.type.dstr()
                     layout.append(
-                        Field(
+                        Field.make(
                             name=member.name,
                             size=member.size,
-                            type_name=type_name,
+                            type_name=member.type.dstr(),
                         )
                     )
                 # Check for padding at the end
@@ -96,37 +101,41 @@ class TypeLib(TypeLibABC):
                 if end_padding > 0:
                     layout.append(Padding(end_padding))
                 return Struct(name=name, layout=layout)
-        return TypeInfo(name=typ.dstr(), size=typ.get_size())
+        return TypeInfo(name=type_name, size=typ.get_size())
 
     def add_type(
         self,
         typ: ida_typeinf.tinfo_t,
-        worklist: Set[str] = set(),
+        worklist: Optional[Set[str]] = None,
     ):
         """
-        Adds an element to the TypeLib by parsing an IDA tinfo_t object
+        Adds an element to the TypeLib by parsing an IDA tinfo_t object. Types
+        whose name is in the worklist are skipped.
 
         :param typ: types as defined by ida
-        :param worklist: set of found types nested within current type
+        :param worklist: set of found types nested within current type, defaults
+            to every type added to this TypeLib so far
         """
-        if typ.dstr() in worklist or typ.is_void():
+        if worklist is None:
+            worklist = self._seen
+        type_name = typ.dstr()
+        if type_name in worklist or typ.is_void():
             return
-        worklist.add(typ.dstr())
+        worklist.add(type_name)
         new_type: TypeInfo = self.parse_type(typ)
         # If this type isn't a duplicate, break down the subtypes
         if not self._data[new_type.size].add(new_type):
-            if typ.is_decl_ptr() and not (typ.is_funcptr() or "(" in typ.dstr()):
+            if typ.is_decl_ptr() and not (typ.is_funcptr() or "(" in type_name):
                 self.add_type(typ.get_pointed_object(), worklist)
             elif typ.is_array():
                 self.add_type(typ.get_array_element(), worklist)
             elif typ.is_udt():
                 udt_info = ida_typeinf.udt_type_data_t()
                 typ.get_udt_details(udt_info)
-                name = typ.dstr()  # noqa: F841
                 size = udt_info.total_size  # noqa: F841
                 nmembers = typ.get_udt_nmembers()
+                member = ida_typeinf.udt_member_t()
                 for n in range(nmembers):
-                    member = ida_typeinf.udt_member_t()
                     # To get the nth member set OFFSET to n and tell find_udt_member
                     # to search by index.
                     member.offset = n
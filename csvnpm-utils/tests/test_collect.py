@@ -0,0 +1,50 @@
+import pytest
+from csvnpm.binary.types.member import Field
+from csvnpm.binary.types.typeinfo import TypeInfo
+from csvnpm.binary.types.typelib import TypeLibABC
+from csvnpm.binary.types.udt import Struct
+from csvnpm.dataset_gen.decompiler.collect import Collector
+from csvnpm.ida.ida_typelib import TypeLib
+
+
+class FakeType:
+    """Stands in for an IDA tinfo_t"""
+
+    def __init__(self, name):
+        self.name = name
+
+    def dstr(self):
+        return self.name
+
+
+def fake_parse_type(typ):
+    if typ.name.startswith("struct"):
+        # Member sizes in bits, as parse_type returns them
+        return Struct(name=typ.name, layout=[Field(name="a", size=32, type_name="int")])
+    return TypeInfo(name=typ.name, size=4)
+
+
+@pytest.fixture
+def collector(tmp_path, monkeypatch):
+    monkeypatch.setenv("OUTPUT_DIR", str(tmp_path))
+    monkeypatch.setenv("PREFIX", "test")
+    monkeypatch.setattr(TypeLib, "parse_type", staticmethod(fake_parse_type))
+    return Collector()
+
+
+@pytest.mark.commit
+def test_parsed_structs_are_independent(collector):
+    first = collector._parse_type(FakeType("struct s"))
+    second = collector._parse_type(FakeType("struct s"))
+    assert first is not second
+    assert TypeLibABC.fix_bit(first)
+    assert first.size == 4
+    assert second.size == 32
+    assert second.layout[0].size == 32
+
+
+@pytest.mark.commit
+def test_parsed_scalars_are_shared(collector):
+    assert collector._parse_type(FakeType("int")) is collector._parse_type(
+        FakeType("int")
+    )
@@ -0,0 +1,39 @@
+import http.server
+import threading
+
+import pytest
+from csvnpm import download
+
+PAYLOAD = bytes(range(256)) * 1024
+
+
+class IgnoresRangeHandler(http.server.BaseHTTPRequestHandler):
+    """Advertises range requests, but always answers with the whole file"""
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Accept-Ranges", "bytes")
+        self.send_header("Content-Length", str(len(PAYLOAD)))
+        self.end_headers()
+        self.wfile.write(PAYLOAD)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = http.server.ThreadingHTTPServer(("127.0.0.1", 0), IgnoresRangeHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield "http://127.0.0.1:%d/file.bin" % httpd.server_address[1]
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.mark.commit
+def test_download_falls_back_without_ranges(server, tmp_path, monkeypatch):
+    monkeypatch.setattr(download, "PARALLEL_MIN_SIZE", 0)
+    download.download(server, str(tmp_path), "file.bin", parallel=4)
+    assert (tmp_path / "file.bin").read_bytes() == PAYLOAD
+    assert not (tmp_path / "file.bin.part").exists()
@@ -0,0 +1,126 @@
+import gzip
+import pickle
+
+import pytest
+from csvnpm.binary.types.member import Field, Padding
+from csvnpm.binary.types.typeinfo import (
+    Array,
+    Disappear,
+    FunctionPointer,
+    Pointer,
+    TypeInfo,
+    Void,
+)
+from csvnpm.binary.types.typelib import Entry, EntryList, TypelessTypeLib, TypeLibCodec
+from csvnpm.binary.types.udt import Struct, Union
+
+INT = Field(name="a", size=4, type_name="int")
+
+# One of each class, keyed by a readable test id
+TYPES = {
+    "typeinfo": TypeInfo(name="int", size=4),
+    "array": Array(nelements=4, element_size=4, element_type="int"),
+    "pointer": Pointer("int"),
+    "field": INT,
+    "padding": Padding(4),
+    "struct": Struct(name="s", layout=[INT, Padding(4)]),
+    "unnamed_struct": Struct(layout=[INT]),
+    "nested_struct": Struct(name="n", layout=[Struct(name="s", layout=[INT]), INT]),
+    "union": Union(name="u", members=[INT]),
+    "padded_union": Union(name="u", members=[INT], padding=Padding(4)),
+    "void": Void(),
+    "function_pointer": FunctionPointer("f"),
+    "disappear": Disappear(),
+}
+
+
+@pytest.mark.commit
+def test_replacements_without_sorted_sizes():
+    lib = TypelessTypeLib()
+    lib.add_entry_list(4, EntryList([Entry(1, TypeInfo(name="int", size=4))]))
+    lib.make_cached_replacement_dict()
+    expected = lib.get_next_replacements((0, 1, 2, 3), (0,))
+    # A library pickled before the size list existed only has the cache
+    del lib._sorted_sizes
+    lib = pickle.loads(pickle.dumps(lib))
+    assert lib.get_next_replacements((0, 1, 2, 3), (0,)) == expected
+    assert expected[0][0] == {TypeInfo(name="int", size=4)}
+
+
+def make_lib():
+    lib = TypelessTypeLib()
+    for freq, typ in enumerate(TYPES.values(), 1):
+        if typ.KIND in (Field.KIND, Padding.KIND):
+            continue
+        if typ.size not in lib:
+            lib.add_entry_list(typ.size, EntryList())
+        lib[typ.size].add_entry(Entry(freq, typ))
+    return lib
+
+
+@pytest.mark.commit
+@pytest.mark.parametrize("typ", TYPES.values(), ids=list(TYPES))
+def test_encode_decode(typ):
+    decoded = TypeLibCodec.decode(TypeLibCodec.encode(typ))
+    assert type(decoded) is type(typ)
+    assert decoded == typ
+    # Equality of fields ignores size, so compare the encodings too
+    assert decoded._to_json() == typ._to_json()
+
+
+@pytest.mark.commit
+def test_typelib_encode_decode():
+    lib = make_lib()
+    decoded = TypeLibCodec.decode(TypeLibCodec.encode(lib))
+    assert isinstance(decoded, TypelessTypeLib)
+    assert TypeLibCodec.encode(decoded) == TypeLibCodec.encode(lib)
+
+
+@pytest.mark.commit
+def test_typelib_dump_add_json_file(tmp_path):
+    lib = make_lib()
+    path = str(tmp_path / "lib.json.gz")
+    with gzip.open(path, "wb") as f:
+        TypeLibCodec.dump(lib, f)
+    loaded = TypelessTypeLib()
+    loaded.add_json_file(path)
+    assert TypeLibCodec.encode(loaded) == TypeLibCodec.encode(lib)
+
+
+@pytest.mark.commit
+def test_decode_dict_format():
+    encoded = '{"T":6,"n":"s","l":[{"T":4,"n":"a","t":"int","s":4},{"T":5,"s":4}]}'
+    assert TypeLibCodec.decode(encoded)._to_json() == TYPES["struct"]._to_json()
+    encoded = '{"T":7,"n":"u","m":[{"T":4,"n":"a","t":"int","s":4}],"p":null}'
+    assert TypeLibCodec.decode(encoded)._to_json() == TYPES["union"]._to_json()
+    encoded = '{"4":[[2,{"T":3,"t":"int"}]],"T":0}'
+    lib = TypeLibCodec.decode(encoded)
+    assert [(e.frequency, e.typeinfo) for e in lib[4]] == [(2, Pointer("int"))]
+
+
+@pytest.mark.commit
+def test_decode_frequencies_equal_to_tags(tmp_path):
+    # Entries are [frequency, type] pairs, their frequencies are not tags
+    encoded = '{"4":[[1,[3,"int"]],[6,[1,"int",4]]],"T":0}'
+    expected = [(1, Pointer("int")), (6, TypeInfo(name="int", size=4))]
+    lib = TypeLibCodec.decode(encoded)
+    assert [(e.frequency, e.typeinfo) for e in lib[4]] == expected
+    path = tmp_path / "lib.json"
+    path.write_text(encoded)
+    loaded = TypelessTypeLib()
+    loaded.add_json_file(str(path))
+    assert [(e.frequency, e.typeinfo) for e in loaded[4]] == expected
+
+
+@pytest.mark.commit
+def test_load_dir_interns_across_shards(tmp_path):
+    # Each shard holds the same type under a different size, so that
+    # entries from the worker processes are not merged away
+    for size in (8, 9, 10):
+        (tmp_path / f"{size}.json").write_text('{"%d":[[1,[3,"int"]]],"T":0}' % size)
+    lib = TypelessTypeLib.load_dir(str(tmp_path), threads=2)
+    interned = TypeLibCodec.decode('[3,"int"]')
+    for size in (8, 9, 10):
+        (entry,) = lib[size]
+        # Decoded in this process, so the type is the interned instance
+        assert entry.typeinfo is interned
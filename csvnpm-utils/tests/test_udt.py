@@ -0,0 +1,13 @@
+import pytest
+from csvnpm.binary.types.member import Field, Padding
+from csvnpm.binary.types.udt import Struct, Union
+
+
+@pytest.mark.commit
+def test_unnamed_udt_str():
+    # The type vocabulary is keyed on these strings, so existing vocab files
+    # and datasets depend on the doubled brace of unnamed UDTs
+    field = Field(name="a", size=4, type_name="int")
+    assert str(Struct(layout=[field, Padding(4)])) == "struct {{ int a; PADDING (4); }"
+    assert str(Union(members=[field])) == "union {{ int a; }"
+    assert str(Struct(name="s", layout=[field])) == "struct s { int a; }"
@@ -35,6 +35,14 @@ from dirty.utils import util  # type: ignore
 from dirty.utils.dataset import Dataset  # type: ignore
 
 
+def _num_workers(n: int) -> int:
+    """
+    :param n: number of data loading workers wanted
+    :return: n, capped by half of the available CPUs
+    """
+    return max(1, min(n, (os.cpu_count() or 2) // 2))
+
+
 def cli(args):
     config = json.loads(_jsonnet.evaluate_file(args["CONFIG_FILE"]))
     if args["--extra-config"]:
@@ -75,19 +83,23 @@ def train(
         percent=percent,
     )
     dev_set = Dataset(config["data"]["dev_file"], config["data"])
+    # Persistent workers keep their processes and open shards across epochs
     train_loader = DataLoader(
         train_set,
         batch_size=batch_size,
         collate_fn=Dataset.collate_fn,
-        num_workers=16,
+        num_workers=_num_workers(16),
         pin_memory=True,
+        persistent_workers=True,
+        prefetch_factor=4,
     )
     val_loader = DataLoader(
         dev_set,
         batch_size=batch_size,
         collate_fn=Dataset.collate_fn,
-        num_workers=8,
+        num_workers=_num_workers(8),
         pin_memory=True,
+        persistent_workers=True,
     )
 
     # model
@@ -119,15 +131,15 @@ def train(
         resume_from_checkpoint=resume_from_checkpoint,
     )
     if evaluation_checkpoint:
-        # HACK: necessary to make pl test work for IterableDataset
-        Dataset.__len__ = lambda self: 1000000
-        test_set = Dataset(config["data"]["test_file"], config["data"])
+        # pl test needs a length for IterableDataset
+        test_set = Dataset(config["data"]["test_file"], config["data"], length=1000000)
         test_loader = DataLoader(
             test_set,
             batch_size=config["test"]["batch_size"],
             collate_fn=Dataset.collate_fn,
-            num_workers=8,
+            num_workers=_num_workers(8),
             pin_memory=True,
+            persistent_workers=True,
         )
         trainer.test(
             model, test_dataloaders=test_loader, ckpt_path=evaluation_checkpoint
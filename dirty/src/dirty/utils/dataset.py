@@ -204,14 +204,22 @@ class Dataset(wds.Dataset):
     SHUFFLE_BUFFER = 5000
     SORT_BUFFER = 512
 
-    def __init__(self, url: str, config: Optional[Dict] = None, percent: float = 1.0):
+    def __init__(
+        self,
+        url: str,
+        config: Optional[Dict] = None,
+        percent: float = 1.0,
+        length: Union[bool, int] = True,
+    ):
         # support wildcards
         urls = sorted(glob.glob(url))
         print(urls)
         if not urls:
             raise GlobPatternResultEmpty
         urls = urls[: int(percent * len(urls))]
-        super().__init__(urls)
+        # length is the number of examples reported by len(), webdataset does
+        # not know the actual number
+        super().__init__(urls, length=length)
         if config:
             # annotate example for training
             from dirty.utils.vocab import Vocab
@@ -389,14 +397,27 @@ class Dataset(wds.Dataset):
             len(examples), max(len(e.src_var_names) for e in examples)
         )
 
+        # Collect the coordinates of all mentions, then fill the tensors with
+        # one indexing operation each instead of one per mention
+        mention_rows: List[int] = []
+        mention_cols: List[int] = []
+        mention_var_ids: List[int] = []
         for e_id, example in enumerate(examples):
             var_name_to_id = {name: i for i, name in enumerate(example.src_var_names)}
             for i, sub_token in enumerate(example.sub_tokens):
-                if sub_token in example.src_var_names:
-                    var_id = var_name_to_id[sub_token]
-                    variable_mention_to_variable_id[e_id, i] = var_id
-                    variable_mention_mask[e_id, i] = 1.0
-                    variable_mention_num[e_id, var_name_to_id[sub_token]] += 1
+                var_id = var_name_to_id.get(sub_token)
+                if var_id is not None:
+                    mention_rows.append(e_id)
+                    mention_cols.append(i)
+                    mention_var_ids.append(var_id)
+        rows = torch.tensor(mention_rows, dtype=torch.long)
+        cols = torch.tensor(mention_cols, dtype=torch.long)
+        var_ids = torch.tensor(mention_var_ids, dtype=torch.long)
+        variable_mention_to_variable_id[rows, cols] = var_ids
+        variable_mention_mask[rows, cols] = 1.0
+        variable_mention_num.index_put_(
+            (rows, var_ids), torch.ones(len(mention_var_ids)), accumulate=True
+        )
         # if mentioned for each var_id
         variable_encoding_mask = (variable_mention_num > 0).float()
 
@@ -441,13 +462,11 @@ class Dataset(wds.Dataset):
 
         return (
             dict(
-                index=sum(
-                    [
-                        [(e.binary, e.name, name) for name in e.src_var_names]
-                        for e in examples
-                    ],
-                    [],
-                ),
+                index=[
+                    (e.binary, e.name, name)
+                    for e in examples
+                    for name in e.src_var_names
+                ],
                 src_code_tokens=input,
                 variable_mention_to_variable_id=variable_mention_to_variable_id,
                 variable_mention_mask=variable_mention_mask,
@@ -460,7 +479,7 @@ class Dataset(wds.Dataset):
                 target_type_sizes=target_type_sizes,
             ),
             dict(
-                tgt_var_names=sum([e.tgt_var_names for e in examples], []),
+                tgt_var_names=[name for e in examples for name in e.tgt_var_names],
                 target_type_id=target_type_id,
                 target_name_id=target_name_id,
                 target_subtype_id=target_subtype_id,
@@ -87,10 +87,9 @@ def type_dumper(args):
                 typelib.add(var.typ)
     typelib.sort()
     with open(
-        os.path.join(tgt_folder, "types", fname.split("/")[-1]), "w"
+        os.path.join(tgt_folder, "types", fname.split("/")[-1]), "wb"
     ) as type_lib_file:
-        encoded = TypeLibCodec.encode(typelib)
-        type_lib_file.write(encoded)
+        TypeLibCodec.dump(typelib, type_lib_file)
 
 
 def main(args):
@@ -201,9 +200,8 @@ def main(args):
     typelib.sort()
 
     print("dumping typelib")
-    with open(os.path.join(tgt_folder, "typelib.json"), "w") as type_lib_file:
-        encoded = TypeLibCodec.encode(typelib)
-        type_lib_file.write(encoded)
+    with open(os.path.join(tgt_folder, "typelib.json"), "wb") as type_lib_file:
+        TypeLibCodec.dump(typelib, type_lib_file)
 
     train_functions = dict()
     for train_file in train_files: